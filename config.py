@@ -1,12 +1,9 @@
 from dotenv import load_dotenv
+import functools
 import os
 
 load_dotenv()
 
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-if not ANTHROPIC_API_KEY:
-    raise ValueError("ANTHROPIC_API_KEY not set in .env")
-
 DB_PATH = os.getenv("DB_PATH", "jobsearch.db")
 CLAUDE_MODEL = "claude-sonnet-4-6"
 
@@ -25,12 +22,15 @@ JOB_FAMILIES = {
     "E": "Director Stretch"
 }
 
-# Stage order for pipeline display
-STAGE_ORDER = [
+# Stage order for pipeline display (tuple — read-only, shared everywhere)
+STAGE_ORDER = (
     "Prospect", "Warm Lead", "Applied",
     "Recruiter Screen", "HM Interview",
     "Loop", "Offer Pending", "Closed"
-]
+)
+
+# O(1) stage → position lookups (avoids STAGE_ORDER.index scans)
+STAGE_INDEX = {s: i for i, s in enumerate(STAGE_ORDER)}
 
 # Owner context defaults for AI engine
 OWNER_CONTEXT = {
@@ -52,10 +52,54 @@ SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
 SMTP_FROM = os.getenv("SMTP_FROM", "noreply@joeysolomon.com")
 SENDER_NAME = os.getenv("SENDER_NAME", "Joey Solomon")
 
-OWNER_BACKGROUND_SUMMARY = (
-    f"Data & Analytics Manager with {OWNER_CONTEXT['years_experience']} in {OWNER_CONTEXT['industries']}. "
-    f"Core stack: {OWNER_CONTEXT['core_stack']}. "
-    f"Management: {OWNER_CONTEXT['management_experience']}. "
-    f"PII/governance: {OWNER_CONTEXT['governance_pii']}. "
-    f"Location: {OWNER_CONTEXT['location']}."
-)
+# app_settings.json cache — re-read only when the file's mtime changes, so
+# scheduler ticks and feed polls stop paying file I/O + JSON parse each call.
+_settings_cache = {"mtime": None, "data": None}
+
+
+def load_app_settings() -> dict:
+    """Return the parsed app_settings.json dict ({} if missing/corrupt).
+
+    Cached on st_mtime_ns: edits (e.g. saving the Settings page) invalidate
+    on the next call; unchanged files cost one stat().
+    """
+    try:
+        mtime = os.stat(APP_SETTINGS_PATH).st_mtime_ns
+    except OSError:
+        _settings_cache["mtime"] = None
+        _settings_cache["data"] = {}
+        return {}
+    if mtime != _settings_cache["mtime"]:
+        try:
+            import json
+            with open(APP_SETTINGS_PATH, encoding="utf-8") as f:
+                _settings_cache["data"] = json.load(f)
+        except Exception:
+            _settings_cache["data"] = {}
+        _settings_cache["mtime"] = mtime
+    return _settings_cache["data"]
+
+
+@functools.cache
+def get_anthropic_key() -> str:
+    """Return the Anthropic API key, failing only when an AI call is attempted.
+
+    Checked lazily so key-free commands (list, export, dashboard browsing)
+    work without a configured .env.
+    """
+    key = os.getenv("ANTHROPIC_API_KEY")
+    if not key:
+        raise ValueError("ANTHROPIC_API_KEY not set in .env")
+    return key
+
+
+@functools.cache
+def owner_background_summary() -> str:
+    """Assemble the owner background blurb for AI prompts (built on first use)."""
+    return (
+        f"Data & Analytics Manager with {OWNER_CONTEXT['years_experience']} in {OWNER_CONTEXT['industries']}. "
+        f"Core stack: {OWNER_CONTEXT['core_stack']}. "
+        f"Management: {OWNER_CONTEXT['management_experience']}. "
+        f"PII/governance: {OWNER_CONTEXT['governance_pii']}. "
+        f"Location: {OWNER_CONTEXT['location']}."
+    )
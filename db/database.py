@@ -1,13 +1,17 @@
 import sqlite3
 import os
 import logging
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 # Module-level connection — used only when DB_PATH is :memory: so tables persist.
-# For file-based DBs, new connections are opened per call (normal SQLite pattern).
+# For file-based DBs, one connection per thread is kept open and reused
+# (sqlite3.connect + PRAGMA setup costs far more than a cursor execute).
 _memory_conn: sqlite3.Connection = None
+_local = threading.local()
 
 
 def _get_db_path() -> str:
@@ -23,18 +27,33 @@ def get_connection() -> sqlite3.Connection:
     """
     Return a sqlite3 connection with row_factory set.
     For :memory: DBs, returns a shared module-level connection so tables persist.
-    For file DBs, opens a new connection (standard practice).
+    For file DBs, returns this thread's persistent connection, opening it on
+    first use (keyed by path so a DB_PATH change in tests gets a fresh one).
     """
     global _memory_conn
     if _is_memory_db():
         if _memory_conn is None:
-            _memory_conn = sqlite3.connect(":memory:", check_same_thread=False)
+            _memory_conn = sqlite3.connect(":memory:", check_same_thread=False, cached_statements=256)
             _memory_conn.row_factory = sqlite3.Row
             _memory_conn.execute("PRAGMA foreign_keys = ON")
         return _memory_conn
-    conn = sqlite3.connect(_get_db_path(), check_same_thread=False)
+    path = _get_db_path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.conn_path == path:
+        return conn
+    conn = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    # One-time tuning per connection: WAL lets readers overlap the writer,
+    # NORMAL sync is safe under WAL, and the cache/mmap settings keep the
+    # hot list queries memory-resident.
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    _local.conn = conn
+    _local.conn_path = path
     return conn
 
 
@@ -59,6 +78,45 @@ def init_db():
             conn.commit()
         except Exception:
             pass  # column already exists
+    # Lets INSERT OR IGNORE dedup feed imports by URL at the engine level.
+    # Unlike the column adds this may legitimately fail (pre-existing
+    # duplicate jd_url rows), and without it feed dedup is fully disabled —
+    # so verify it exists and shout if it doesn't.
+    try:
+        conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_opp_jd_url"
+            " ON opportunities(jd_url) WHERE jd_url IS NOT NULL"
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        logger.error(
+            "Could not create unique index ix_opp_jd_url (%s). Feed polling "
+            "dedups through this index, so duplicate postings WILL be "
+            "re-inserted until the duplicate jd_url rows are cleaned up.", e
+        )
+
+
+@contextmanager
+def transaction():
+    """
+    Group many writes into one transaction (one fsync at commit instead of
+    one per statement). execute_query calls inside the block skip their
+    per-statement commit; nesting is transparent — only the outermost block
+    commits or rolls back.
+    """
+    conn = get_connection()
+    if getattr(_local, "in_txn", False):
+        yield conn
+        return
+    _local.in_txn = True
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _local.in_txn = False
 
 
 def execute_query(sql: str, params: tuple = (), *, fetch: str = None):
@@ -74,12 +132,28 @@ def execute_query(sql: str, params: tuple = (), *, fetch: str = None):
             return cur.fetchone()
         elif fetch == "all":
             return cur.fetchall()
-        elif sql.strip().upper().startswith("INSERT"):
+        in_txn = getattr(_local, "in_txn", False)
+        if sql.strip().upper().startswith("INSERT"):
+            if not in_txn:
+                conn.commit()
+            # rowcount is 0 when INSERT OR IGNORE hit a conflict — no new row.
+            return cur.lastrowid if cur.rowcount else None
+        if not in_txn:
             conn.commit()
-            return cur.lastrowid
-        else:
-            conn.commit()
-            return cur.rowcount
+        return cur.rowcount
+    except sqlite3.Error as e:
+        logger.error(f"Database error: {e} | SQL: {sql[:120]} | Params: {params}")
+        raise
+
+
+def iter_query(sql: str, params: tuple = ()):
+    """
+    Yield SELECT rows straight off the cursor instead of materializing a list.
+    Lets callers (e.g. streamed template renders) overlap row fetching with
+    whatever they do per row; the cursor stays on this thread's connection.
+    """
+    try:
+        yield from get_connection().execute(sql, params)
     except sqlite3.Error as e:
         logger.error(f"Database error: {e} | SQL: {sql[:120]} | Params: {params}")
         raise
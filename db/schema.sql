@@ -80,6 +80,26 @@ CREATE TABLE IF NOT EXISTS activity_log (
     created_at        DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
+-- FEED CACHE (conditional-GET state for the RSS/Atom poller)
+CREATE TABLE IF NOT EXISTS feed_cache (
+    url               TEXT PRIMARY KEY,
+    etag              TEXT,
+    last_modified     TEXT,
+    body_sha256       TEXT
+);
+
+-- INDEXES
+CREATE INDEX IF NOT EXISTS idx_contacts_opp_status_created
+    ON contacts(opportunity_id, response_status, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS ix_activity_opp_created
+    ON activity_log(opportunity_id, created_at DESC);
+
+-- Stale-record scan (open opps ordered/filtered by updated_at) stays an
+-- index range scan instead of walking the whole table.
+CREATE INDEX IF NOT EXISTS ix_opp_open_updated
+    ON opportunities(updated_at) WHERE stage != 'Closed';
+
 -- TRIGGERS: auto-update updated_at
 CREATE TRIGGER IF NOT EXISTS opp_updated
 AFTER UPDATE ON opportunities
@@ -0,0 +1,23 @@
+"""
+jsonutil.py — Shared orjson shim with stdlib fallback.
+
+orjson parses/serializes the JSON TEXT columns several times faster than
+stdlib json but stays optional; modules import json_dumps/json_loads from
+here instead of carrying their own fallback copy, so the behavior can't
+drift between copies. `orjson` itself is exported as None when absent for
+callers that need to know (e.g. the Flask JSON provider).
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+    json_loads = orjson.loads
+else:
+    json_dumps = json.dumps
+    json_loads = json.loads
@@ -8,7 +8,7 @@ import os
 import json
 import logging
 from pathlib import Path
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
 import click
 
@@ -23,6 +23,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _read_until_end() -> str:
+    """Read pasted stdin up to a line containing only END (or EOF)."""
+    buf = []
+    for line in sys.stdin:
+        if line.strip() == "END":
+            break
+        buf.append(line)
+    return "".join(buf)
+
+
 def _load_resume() -> str:
     """Load resume text from cache file, prompting if not present."""
     from config import RESUME_CACHE_PATH
@@ -31,16 +41,7 @@ def _load_resume() -> str:
         return cache.read_text()
     click.echo("\n📄 No resume cache found. Paste your resume text below.")
     click.echo("(Paste all text, then press Enter, then type END on a new line and press Enter)\n")
-    lines = []
-    while True:
-        try:
-            line = input()
-        except EOFError:
-            break
-        if line.strip() == "END":
-            break
-        lines.append(line)
-    resume_text = "\n".join(lines)
+    resume_text = _read_until_end()
     cache.write_text(resume_text)
     click.echo(f"✓ Resume saved to {RESUME_CACHE_PATH}")
     return resume_text
@@ -65,7 +66,7 @@ def cli():
 def add_job():
     """Ingest a job posting (paste text or URL) and add to pipeline."""
     from modules.ingester import ingest_jd
-    from models.opportunity import create_opportunity
+    from models.opportunity import create_opportunity, encode_keywords
     from models.activity import log_activity
     from modules.workflow import calculate_next_action
 
@@ -82,16 +83,7 @@ def add_job():
         source = click.prompt("Job posting URL")
     else:
         click.echo("Paste job description (type END on a new line when done):\n")
-        lines = []
-        while True:
-            try:
-                line = input()
-            except EOFError:
-                break
-            if line.strip() == "END":
-                break
-            lines.append(line)
-        source = "\n".join(lines)
+        source = _read_until_end()
 
     click.echo("\n⏳ Parsing job description with AI...")
     try:
@@ -121,7 +113,7 @@ def add_job():
     salary = click.prompt("Salary range", default=structured.get("salary_range") or "", show_default=False)
 
     keywords_list = structured.get("keywords", [])
-    keywords_json = json.dumps(keywords_list)
+    keywords_json = encode_keywords(keywords_list)
     next_action_text, days_out = calculate_next_action("Prospect")
     next_action_date = (date.today() + timedelta(days=days_out)).isoformat()
 
@@ -330,7 +322,6 @@ def follow_up():
         if action == "sent":
             # Determine which day field to update
             day0 = item.get("outreach_day0")
-            from datetime import datetime, timedelta
             d0 = datetime.fromisoformat(day0) if day0 else None
             days_since = (datetime.today() - d0).days if d0 else 0
             if days_since >= 6:
@@ -430,20 +421,11 @@ def tailor(opp_id):
         click.echo(f"❌ Opportunity {opp_id} not found.", err=True)
         sys.exit(1)
 
-    keywords = json.loads(opp.jd_keywords) if opp.jd_keywords else []
+    keywords = opp.keywords
     jd_context = (opp.jd_raw or "")[:2000]
 
     click.echo("\nPaste your resume bullets (one per line, type END when done):\n")
-    lines = []
-    while True:
-        try:
-            line = input()
-        except EOFError:
-            break
-        if line.strip() == "END":
-            break
-        if line.strip():
-            lines.append(line.strip())
+    lines = [l.strip() for l in _read_until_end().splitlines() if l.strip()]
 
     if not lines:
         click.echo("❌ No bullets entered.", err=True)
@@ -484,25 +466,30 @@ def dashboard():
 def export():
     """Export all opportunities to CSV."""
     import csv
-    from models.opportunity import list_opportunities
+    from db.database import get_connection
 
-    opps = list_opportunities()
     filename = f"jobsearch_export_{date.today().isoformat()}.csv"
 
-    if not opps:
+    # Stream rows straight from the cursor — no Opportunity objects or
+    # per-row dicts, so memory stays flat regardless of pipeline size.
+    cur = get_connection().execute(
+        "SELECT * FROM opportunities ORDER BY tier ASC, date_added DESC"
+    )
+    first = cur.fetchone()
+    if first is None:
         click.echo("No opportunities to export.")
         return
 
-    fieldnames = [f for f in opps[0].to_dict().keys()
-                  if not f.endswith("_parsed") and not f.endswith("_list")]
-
     with open(filename, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writeheader()
-        for opp in opps:
-            writer.writerow({k: v for k, v in opp.to_dict().items() if k in fieldnames})
-
-    click.echo(f"✅ Exported {len(opps)} opportunities to {filename}")
+        writer = csv.writer(f)
+        writer.writerow([d[0] for d in cur.description])
+        writer.writerow(tuple(first))
+        count = 1
+        for row in cur:
+            writer.writerow(tuple(row))
+            count += 1
+
+    click.echo(f"✅ Exported {count} opportunities to {filename}")
 
 
 @cli.command("list")
@@ -1,13 +1,13 @@
 from __future__ import annotations
 import sqlite3
-import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from typing import Optional
 
 from db.database import execute_query
+from jsonutil import json_dumps as _json_dumps, json_loads as _json_loads
 
 
-@dataclass
+@dataclass(slots=True)
 class ActivityLog:
     id: Optional[int] = None
     opportunity_id: Optional[int] = None
@@ -19,18 +19,32 @@ class ActivityLog:
 
     @classmethod
     def from_row(cls, row: sqlite3.Row) -> "ActivityLog":
-        return cls(**{k: row[k] for k in row.keys()})
+        # Field names are known up front — skip the per-row row.keys() call.
+        return cls(*(row[k] for k in _ACTIVITY_FIELDS))
+
+    @property
+    def parsed_metadata(self) -> dict:
+        """metadata parsed on demand ({} on bad/missing data) — list views
+        that never touch it pay no JSON cost."""
+        if not self.metadata:
+            return {}
+        try:
+            return _json_loads(self.metadata)
+        except (ValueError, TypeError):
+            return {}
 
     def to_dict(self) -> dict:
-        d = asdict(self)
+        # Flat record — a direct dict build skips asdict's recursive deepcopy.
+        d = {name: getattr(self, name) for name in _ACTIVITY_FIELDS}
         if d.get("metadata"):
-            try:
-                d["metadata_parsed"] = json.loads(d["metadata"])
-            except (json.JSONDecodeError, TypeError):
-                d["metadata_parsed"] = {}
+            d["metadata_parsed"] = self.parsed_metadata
         return d
 
 
+_ACTIVITY_FIELDS = tuple(f.name for f in fields(ActivityLog))
+_ACTIVITY_COLUMNS = ", ".join(_ACTIVITY_FIELDS)
+
+
 # ── CRUD ──────────────────────────────────────────────────────────────────────
 
 def log_activity(
@@ -41,7 +55,7 @@ def log_activity(
     metadata: dict = None,
 ) -> int:
     """Append an immutable activity log entry. Returns the new row id."""
-    meta_str = json.dumps(metadata) if metadata else None
+    meta_str = _json_dumps(metadata) if metadata else None
     return execute_query(
         """INSERT INTO activity_log
              (opportunity_id, contact_id, activity_type, description, metadata)
@@ -51,15 +65,17 @@ def log_activity(
 
 
 def get_activity_log(opportunity_id: int = None, limit: int = 50) -> list[ActivityLog]:
+    # Explicit column list keeps the positional from_row mapping stable
+    # regardless of any future table-level column additions.
     if opportunity_id is not None:
         rows = execute_query(
-            "SELECT * FROM activity_log WHERE opportunity_id = ? ORDER BY created_at DESC LIMIT ?",
+            f"SELECT {_ACTIVITY_COLUMNS} FROM activity_log WHERE opportunity_id = ? ORDER BY created_at DESC LIMIT ?",
             (opportunity_id, limit),
             fetch="all"
         )
     else:
         rows = execute_query(
-            "SELECT * FROM activity_log ORDER BY created_at DESC LIMIT ?",
+            f"SELECT {_ACTIVITY_COLUMNS} FROM activity_log ORDER BY created_at DESC LIMIT ?",
             (limit,),
             fetch="all"
         )
@@ -1,12 +1,13 @@
 from __future__ import annotations
 import sqlite3
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from typing import Optional
 
-from db.database import execute_query
+from db.database import execute_query, get_connection
 
 
-@dataclass
+@dataclass(slots=True)
 class Contact:
     id: Optional[int] = None
     opportunity_id: Optional[int] = None
@@ -29,10 +30,15 @@ class Contact:
 
     @classmethod
     def from_row(cls, row: sqlite3.Row) -> "Contact":
-        return cls(**{k: row[k] for k in row.keys()})
+        # Field names are known up front — skip the per-row row.keys() call.
+        return cls(*(row[k] for k in _CONTACT_FIELDS))
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Flat record — a direct dict build skips asdict's recursive deepcopy.
+        return {name: getattr(self, name) for name in _CONTACT_FIELDS}
+
+
+_CONTACT_FIELDS = tuple(f.name for f in fields(Contact))
 
 
 # ── CRUD ──────────────────────────────────────────────────────────────────────
@@ -57,6 +63,27 @@ def create_contact(
     ))
 
 
+def create_contacts_bulk(rows: list[dict]) -> int:
+    """
+    Insert many contacts in one transaction (one fsync instead of one per row).
+    Each dict takes the same keys as create_contact. Returns the insert count.
+    """
+    if not rows:
+        return 0
+    conn = get_connection()
+    with conn:
+        conn.executemany(
+            """INSERT INTO contacts
+                 (opportunity_id, full_name, title, company, linkedin_url, email, contact_type, notes)
+               VALUES (?,?,?,?,?,?,?,?)""",
+            [(
+                r.get("opportunity_id"), r["full_name"], r.get("title"), r.get("company"),
+                r.get("linkedin_url"), r.get("email"), r.get("contact_type"), r.get("notes"),
+            ) for r in rows],
+        )
+    return len(rows)
+
+
 def get_contact(contact_id: int) -> Optional[Contact]:
     row = execute_query(
         "SELECT * FROM contacts WHERE id = ?", (contact_id,), fetch="one"
@@ -64,17 +91,26 @@ def get_contact(contact_id: int) -> Optional[Contact]:
     return Contact.from_row(row) if row else None
 
 
+@lru_cache(maxsize=64)
+def _update_sql(keys: tuple[str, ...]) -> str:
+    # Byte-identical SQL per key combination lets sqlite3's per-connection
+    # statement cache reuse the prepared plan instead of re-parsing.
+    return f"UPDATE contacts SET {', '.join(f'{k} = ?' for k in keys)} WHERE id = ?"
+
+
 def update_contact(contact_id: int, **kwargs) -> int:
     if not kwargs:
         return 0
-    set_clause = ", ".join(f"{k} = ?" for k in kwargs)
-    values = list(kwargs.values()) + [contact_id]
-    return execute_query(
-        f"UPDATE contacts SET {set_clause} WHERE id = ?", tuple(values)
-    )
+    keys = tuple(sorted(kwargs))
+    values = [kwargs[k] for k in keys] + [contact_id]
+    return execute_query(_update_sql(keys), tuple(values))
 
 
-def list_contacts(opportunity_id: int = None, response_status: str = None) -> list[Contact]:
+def list_contacts(
+    opportunity_id: int = None,
+    response_status: str = None,
+) -> list[Contact]:
+    """List contacts, newest first, as full Contact objects."""
     conditions = []
     params = []
     if opportunity_id is not None:
@@ -92,5 +128,33 @@ def list_contacts(opportunity_id: int = None, response_status: str = None) -> li
     return [Contact.from_row(r) for r in rows] if rows else []
 
 
+def list_contacts_with_followup() -> list[dict]:
+    """
+    All contacts, newest first, each carrying an is_followup flag computed
+    in SQL — one query instead of list_contacts() + the follow-up queue and
+    a per-row set lookup. The flag matches get_followup_queue's rule: still
+    Pending on an open opportunity with a Day-3 or Day-7 touch due today.
+    Projects only the columns the contacts page renders, not all 17.
+    """
+    from datetime import date, timedelta
+    day3 = (date.today() - timedelta(days=3)).isoformat()
+    day7 = (date.today() - timedelta(days=7)).isoformat()
+    rows = execute_query(
+        """SELECT c.id, c.opportunity_id, c.full_name, c.title, c.company,
+                  c.contact_type, c.outreach_day0, c.response_status,
+                  (c.response_status = 'Pending'
+                   AND EXISTS(SELECT 1 FROM opportunities o
+                              WHERE o.id = c.opportunity_id AND o.stage != 'Closed')
+                   AND ((c.outreach_day0 = ? AND c.outreach_day3 IS NULL)
+                        OR (c.outreach_day0 = ? AND c.outreach_day7 IS NULL))
+                  ) AS is_followup
+           FROM contacts c
+           ORDER BY c.created_at DESC""",
+        (day3, day7),
+        fetch="all"
+    )
+    return [dict(r) for r in rows] if rows else []
+
+
 def get_contacts_for_opportunity(opportunity_id: int) -> list[Contact]:
     return list_contacts(opportunity_id=opportunity_id)
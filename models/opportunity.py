@@ -1,11 +1,17 @@
 from __future__ import annotations
 import sqlite3
-import json
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, asdict, fields
+from functools import cached_property
 from typing import Optional
 from datetime import date, datetime
 
 from db.database import execute_query
+from jsonutil import json_dumps as _json_dumps, json_loads as _json_loads
+
+
+def encode_keywords(keywords: list[str]) -> str:
+    """Serialize a keyword list for the jd_keywords TEXT column."""
+    return _json_dumps(keywords or [])
 
 
 @dataclass
@@ -38,24 +44,35 @@ class Opportunity:
 
     @classmethod
     def from_row(cls, row: sqlite3.Row) -> "Opportunity":
-        return cls(**{k: row[k] for k in row.keys()})
+        # Field names are known up front — skip the per-row row.keys() call.
+        return cls(*(row[k] for k in _OPPORTUNITY_FIELDS))
+
+    @cached_property
+    def keywords(self) -> list:
+        """jd_keywords parsed once per instance (empty list on bad/missing data)."""
+        if not self.jd_keywords:
+            return []
+        try:
+            return _json_loads(self.jd_keywords)
+        except (ValueError, TypeError):
+            return []
 
     def to_dict(self) -> dict:
         d = asdict(self)
         # Parse JSON fields for convenience
         if d.get("jd_keywords"):
-            try:
-                d["jd_keywords_list"] = json.loads(d["jd_keywords"])
-            except (json.JSONDecodeError, TypeError):
-                d["jd_keywords_list"] = []
+            d["jd_keywords_list"] = self.keywords
         if d.get("ai_fit_summary"):
             try:
-                d["ai_fit_summary_parsed"] = json.loads(d["ai_fit_summary"])
-            except (json.JSONDecodeError, TypeError):
+                d["ai_fit_summary_parsed"] = _json_loads(d["ai_fit_summary"])
+            except (ValueError, TypeError):
                 d["ai_fit_summary_parsed"] = {}
         return d
 
 
+_OPPORTUNITY_FIELDS = tuple(f.name for f in fields(Opportunity))
+
+
 # ── CRUD ──────────────────────────────────────────────────────────────────────
 
 def create_opportunity(
@@ -74,10 +91,18 @@ def create_opportunity(
     notes: str = None,
     fit_score: int = None,
     ai_fit_summary: str = None,
-) -> int:
-    """Insert a new opportunity and return its id."""
-    sql = """
-        INSERT INTO opportunities
+    ignore_duplicate_url: bool = False,
+) -> Optional[int]:
+    """
+    Insert a new opportunity and return its id.
+
+    With ignore_duplicate_url=True the insert becomes INSERT OR IGNORE against
+    the unique jd_url index and returns None when the URL is already stored —
+    the feed poller's dedup path, with no read query needed.
+    """
+    verb = "INSERT OR IGNORE" if ignore_duplicate_url else "INSERT"
+    sql = f"""
+        {verb} INTO opportunities
           (company, role_title, job_family, tier, stage, source, salary_range,
            jd_url, jd_raw, jd_keywords, next_action, next_action_date, notes,
            fit_score, ai_fit_summary)
@@ -97,6 +122,19 @@ def get_opportunity(opp_id: int) -> Optional[Opportunity]:
     return Opportunity.from_row(row) if row else None
 
 
+def append_note(opp_id: int, line: str) -> int:
+    """Append a line to the notes column in one UPDATE — no read-back needed.
+
+    NULLIF makes empty/NULL notes concat to NULL, so COALESCE falls through to
+    the bare line and the first note never starts with the separator newline.
+    Returns rowcount (0 when the id is unknown).
+    """
+    return execute_query(
+        "UPDATE opportunities SET notes = COALESCE(NULLIF(notes, '') || ?, ?) WHERE id = ?",
+        (f"\n{line}", line, opp_id),
+    )
+
+
 def update_opportunity(opp_id: int, **kwargs) -> int:
     """Update arbitrary fields on an opportunity. Returns rowcount."""
     if not kwargs:
@@ -108,36 +146,56 @@ def update_opportunity(opp_id: int, **kwargs) -> int:
     )
 
 
+# list_opportunities SQL keyed by which filters are active — only a handful of
+# combinations ever occur, so each string is built (and planned) once.
+_LIST_SQL_CACHE: dict[tuple, str] = {}
+
+
+def _list_sql(stage, tier, job_family, exclude_closed) -> tuple[str, tuple]:
+    key = (bool(stage), bool(tier), bool(job_family), exclude_closed)
+    sql = _LIST_SQL_CACHE.get(key)
+    if sql is None:
+        conditions = []
+        if stage:
+            conditions.append("stage = ?")
+        if tier:
+            conditions.append("tier = ?")
+        if job_family:
+            conditions.append("job_family = ?")
+        if exclude_closed:
+            conditions.append("stage != 'Closed'")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT * FROM opportunities {where} ORDER BY tier ASC, date_added DESC"
+        _LIST_SQL_CACHE[key] = sql
+    return sql, tuple(p for p in (stage, tier, job_family) if p)
+
+
 def list_opportunities(
     stage: str = None,
     tier: int = None,
     job_family: str = None,
     exclude_closed: bool = False,
 ) -> list[Opportunity]:
-    conditions = []
-    params = []
-
-    if stage:
-        conditions.append("stage = ?")
-        params.append(stage)
-    if tier:
-        conditions.append("tier = ?")
-        params.append(tier)
-    if job_family:
-        conditions.append("job_family = ?")
-        params.append(job_family)
-    if exclude_closed:
-        conditions.append("stage != 'Closed'")
-
-    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-    rows = execute_query(
-        f"SELECT * FROM opportunities {where} ORDER BY tier ASC, date_added DESC",
-        tuple(params),
-        fetch="all"
-    )
+    sql, params = _list_sql(stage, tier, job_family, exclude_closed)
+    rows = execute_query(sql, params, fetch="all")
     return [Opportunity.from_row(r) for r in rows] if rows else []
 
 
+def iter_opportunities(
+    stage: str = None,
+    tier: int = None,
+    job_family: str = None,
+    exclude_closed: bool = False,
+):
+    """Same filters as list_opportunities, but yields rows straight off the
+    cursor — used by the streamed pipeline page so the full list is never
+    held in memory at once."""
+    from db.database import iter_query
+    sql, params = _list_sql(stage, tier, job_family, exclude_closed)
+    for row in iter_query(sql, params):
+        yield Opportunity.from_row(row)
+
+
 def delete_opportunity(opp_id: int) -> None:
     """Delete an opportunity and its associated activity log entries."""
     execute_query("DELETE FROM activity_log WHERE opportunity_id = ?", (opp_id,))
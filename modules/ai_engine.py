@@ -10,7 +10,7 @@ from typing import Optional
 
 import anthropic
 
-from config import CLAUDE_MODEL, OWNER_BACKGROUND_SUMMARY
+from config import CLAUDE_MODEL, get_anthropic_key, owner_background_summary
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,7 @@ _client: Optional[anthropic.Anthropic] = None
 def _get_client() -> anthropic.Anthropic:
     global _client
     if _client is None:
-        _client = anthropic.Anthropic()  # reads ANTHROPIC_API_KEY from env
+        _client = anthropic.Anthropic(api_key=get_anthropic_key())
     return _client
 
 
@@ -137,7 +137,7 @@ def draft_outreach(context: dict) -> dict:
     context keys: contact_name, contact_title, company, contact_type, hook, my_background_summary
     Returns: {linkedin_note, inmail_or_email, subject_line}
     """
-    background = context.get("my_background_summary", OWNER_BACKGROUND_SUMMARY)
+    background = context.get("my_background_summary") or owner_background_summary()
 
     system_prompt = (
         "You are a professional career coach. Draft personalized outreach messages. "
@@ -305,7 +305,7 @@ def generate_cover_letter(
 Role: {role_title} at {company}
 
 Candidate background:
-{OWNER_BACKGROUND_SUMMARY}
+{owner_background_summary()}
 
 RESUME (for context):
 {resume_text}
@@ -347,7 +347,7 @@ def generate_tailored_resume(resume_text: str, jd_text: str, opportunity_id: int
         "Respond ONLY with valid JSON. No explanation outside the JSON object."
     )
     user_message = f"""Candidate background:
-{OWNER_BACKGROUND_SUMMARY}
+{owner_background_summary()}
 
 EXISTING RESUME:
 {resume_text}
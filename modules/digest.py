@@ -3,6 +3,7 @@ digest.py — Daily digest: pull queue data, call AI, print and optionally log.
 """
 from __future__ import annotations
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -10,6 +11,19 @@ logger = logging.getLogger(__name__)
 
 DIGEST_LOG = Path("digest_log.txt")
 
+# Single worker keeps appends ordered while the caller (often a dashboard
+# request thread) doesn't wait on the disk write.
+_LOG_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="digest-log")
+
+
+def _append_log(text: str) -> None:
+    try:
+        with open(DIGEST_LOG, "a") as f:
+            f.write(text)
+        logger.info(f"Digest written to {DIGEST_LOG}")
+    except OSError as e:
+        logger.error(f"Could not write digest log: {e}")
+
 
 def run_daily_digest(write_log: bool = True) -> str:
     """
@@ -37,8 +51,6 @@ def run_daily_digest(write_log: bool = True) -> str:
     print(output)
 
     if write_log:
-        with open(DIGEST_LOG, "a") as f:
-            f.write(output)
-        logger.info(f"Digest written to {DIGEST_LOG}")
+        _LOG_EXECUTOR.submit(_append_log, output)
 
     return digest
@@ -7,36 +7,69 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+try:
+    import lxml  # noqa: F401 — only probed so we can pick the C parser
+    _BS_PARSER = "lxml"
+except ImportError:
+    _BS_PARSER = "html.parser"
+
+# Hard cap on how much of a JD page we download — some job boards pad
+# postings with megabytes of unrelated markup.
+_MAX_FETCH_BYTES = 2_000_000
+
+# Elements that never contain JD text, and the likely content containers
+# (tried one selector at a time — a CSS selector list matches in document
+# order, which would break the preference order).
+_NOISE_TAGS = ("script", "style", "nav", "footer", "header", "aside")
+_MAIN_SELECTORS = ("main", "article", "#job-description", ".job-description", ".description")
+
+_UA_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+}
+
+_client = None
+
+
+def _get_http_client():
+    """Lazily build one shared httpx.Client so repeat ingests reuse connections."""
+    global _client
+    if _client is None:
+        import atexit
+        import httpx
+        _client = httpx.Client(headers=_UA_HEADERS, timeout=15, follow_redirects=True)
+        atexit.register(_client.close)
+    return _client
+
 
 def _fetch_url(url: str) -> str:
     """Fetch a URL and extract main text content."""
     try:
-        import httpx
         from bs4 import BeautifulSoup
 
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-        }
-        resp = httpx.get(url, headers=headers, timeout=15, follow_redirects=True)
-        resp.raise_for_status()
+        with _get_http_client().stream("GET", url) as resp:
+            resp.raise_for_status()
+            buf = bytearray()
+            for chunk in resp.iter_bytes(65536):
+                buf += chunk
+                if len(buf) >= _MAX_FETCH_BYTES:
+                    logger.warning(f"Truncating JD download at {_MAX_FETCH_BYTES} bytes: {url}")
+                    break
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = BeautifulSoup(bytes(buf), _BS_PARSER)
 
         # Remove navigation/footer/script noise
-        for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
+        for tag in soup(_NOISE_TAGS):
             tag.decompose()
 
-        # Try to find main content area first
-        main = (
-            soup.find("main")
-            or soup.find("article")
-            or soup.find(id="job-description")
-            or soup.find(class_="job-description")
-            or soup.find(class_="description")
-        )
+        # Try to find the main content area, best candidate first
+        main = None
+        for sel in _MAIN_SELECTORS:
+            main = soup.select_one(sel)
+            if main:
+                break
         target = main if main else soup.find("body")
         text = target.get_text(separator="\n", strip=True) if target else soup.get_text()
 
@@ -9,13 +9,14 @@ SMTP settings are resolved at send time from (highest priority first):
   2. Environment variables
   3. Config module defaults
 """
-import json
-import os
 import smtplib
+import threading
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
-from config import APP_SETTINGS_PATH, SENDER_NAME, SMTP_FROM, SMTP_HOST, SMTP_PORT
+from config import SENDER_NAME, SMTP_FROM, SMTP_HOST, SMTP_PORT, load_app_settings
+
+_local = threading.local()
 
 
 def _live_cfg() -> dict:
@@ -26,35 +27,80 @@ def _live_cfg() -> dict:
         "from_addr": SMTP_FROM,
         "sender_name": SENDER_NAME,
     }
-    if os.path.exists(APP_SETTINGS_PATH):
+    saved = load_app_settings()
+    try:
+        if "smtp_host" in saved:
+            cfg["host"] = saved["smtp_host"]
+        if "smtp_port" in saved:
+            cfg["port"] = int(saved["smtp_port"])
+        if "smtp_from" in saved:
+            cfg["from_addr"] = saved["smtp_from"]
+        if "sender_name" in saved:
+            cfg["sender_name"] = saved["sender_name"]
+    except Exception:
+        pass
+    return cfg
+
+
+def _build_msg(cfg: dict, to_addr: str, subject: str, body: str) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg["From"] = f"{cfg['sender_name']} <{cfg['from_addr']}>"
+    msg["To"] = to_addr
+    msg["Subject"] = subject
+    msg.attach(MIMEText(body, "plain"))
+    return msg
+
+
+def _get_server(cfg: dict) -> smtplib.SMTP:
+    """Return this thread's open relay connection, reconnecting if settings changed."""
+    key = (cfg["host"], cfg["port"])
+    server = getattr(_local, "server", None)
+    if server is not None and _local.server_key == key:
+        return server
+    if server is not None:
         try:
-            with open(APP_SETTINGS_PATH, encoding="utf-8") as f:
-                saved = json.load(f)
-            if "smtp_host" in saved:
-                cfg["host"] = saved["smtp_host"]
-            if "smtp_port" in saved:
-                cfg["port"] = int(saved["smtp_port"])
-            if "smtp_from" in saved:
-                cfg["from_addr"] = saved["smtp_from"]
-            if "sender_name" in saved:
-                cfg["sender_name"] = saved["sender_name"]
-        except Exception:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
             pass
-    return cfg
+    server = smtplib.SMTP(cfg["host"], cfg["port"], timeout=10)
+    _local.server = server
+    _local.server_key = key
+    return server
+
+
+def _drop_server() -> None:
+    _local.server = None
 
 
 def send_email(to_addr: str, subject: str, body: str) -> None:
     """Send a plain-text email via the LAN SMTP relay.
 
-    Raises smtplib.SMTPException (or socket errors) on failure — callers
-    should catch and return a user-friendly error.
+    Reuses one relay connection per thread (handshake + EHLO cost once, not
+    per message), transparently reconnecting if the relay dropped it between
+    sends. Raises smtplib.SMTPException (or socket errors) on failure —
+    callers should catch and return a user-friendly error.
     """
     cfg = _live_cfg()
-    msg = MIMEMultipart()
-    msg["From"] = f"{cfg['sender_name']} <{cfg['from_addr']}>"
-    msg["To"] = to_addr
-    msg["Subject"] = subject
-    msg.attach(MIMEText(body, "plain"))
+    msg = _build_msg(cfg, to_addr, subject, body)
+    try:
+        _get_server(cfg).send_message(msg)
+    except (smtplib.SMTPServerDisconnected, OSError):
+        # Stale cached connection — reopen once and retry.
+        _drop_server()
+        _get_server(cfg).send_message(msg)
+
+
+def send_emails(messages: list[tuple[str, str, str]]) -> int:
+    """Send a burst of (to_addr, subject, body) messages on one connection.
 
+    Returns the number sent; raises on the first failure like send_email.
+    """
+    if not messages:
+        return 0
+    cfg = _live_cfg()
+    sent = 0
     with smtplib.SMTP(cfg["host"], cfg["port"], timeout=10) as server:
-        server.sendmail(cfg["from_addr"], [to_addr], msg.as_string())
+        for to_addr, subject, body in messages:
+            server.send_message(_build_msg(cfg, to_addr, subject, body))
+            sent += 1
+    return sent
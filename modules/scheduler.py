@@ -3,25 +3,22 @@ modules/scheduler.py — Background job scheduler.
 Runs in a daemon thread while the Flask dashboard is up.
 Activated by web/app.py:run() — not used during CLI-only sessions.
 """
-import json
+import logging
 import threading
-import time
 
 import schedule
 
-from config import APP_SETTINGS_PATH
+from config import load_app_settings
 from modules.digest import run_daily_digest
 from modules.workflow import flag_stale_records
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_DIGEST_TIME = "08:00"
 
 
 def _load_digest_time() -> str:
-    try:
-        with open(APP_SETTINGS_PATH, encoding="utf-8") as f:
-            return json.load(f).get("digest_time", DEFAULT_DIGEST_TIME)
-    except Exception:
-        return DEFAULT_DIGEST_TIME
+    return load_app_settings().get("digest_time", DEFAULT_DIGEST_TIME)
 
 
 def _run_feed_poll():
@@ -31,44 +28,85 @@ def _run_feed_poll():
         if not cfg["urls"]:
             return
         result = poll_feeds(cfg["urls"], cfg["keywords"])
-        print(f"[scheduler] Feed poll: {result['added']} added, {result['skipped']} skipped, {result['errors']} errors.")
-        for title in result.get("new", []):
-            print(f"  + {title}")
+        # One buffered log record per run instead of a flushed print per title.
+        lines = [f"Feed poll: {result['added']} added, {result['skipped']} skipped, {result['errors']} errors."]
+        lines.extend(f"  + {title}" for title in result.get("new", []))
+        logger.info("\n".join(lines))
     except Exception as e:
-        print(f"[scheduler] Feed poll error: {e}")
+        logger.error("Feed poll error: %s", e)
 
 
 def _run_stale_check():
     stale = flag_stale_records(days_stale=7)
     if stale:
-        print(f"[scheduler] WARNING: {len(stale)} stale record(s) — no update in 7+ days:")
-        for opp in stale:
-            print(f"  - {opp['company']} — {opp['role_title']} (stage: {opp['stage']})")
+        lines = [f"WARNING: {len(stale)} stale record(s) — no update in 7+ days:"]
+        lines.extend(
+            f"  - {opp['company']} — {opp['role_title']} (stage: {opp['stage']})"
+            for opp in stale
+        )
+        logger.warning("\n".join(lines))
     else:
-        print("[scheduler] Stale check: no stale records.")
+        logger.info("Stale check: no stale records.")
+
+
+# Set by reschedule() to interrupt the sleep so the loop re-computes its
+# next fire time instead of dozing toward the old one.
+_wake = threading.Event()
+
+# Guards the schedule registry: reschedule() mutates it from a request
+# thread while the loop reads it, and the schedule library has no lock
+# of its own.
+_sched_lock = threading.Lock()
+
+_DAILY_TAG = "daily"
+
+
+def _register_daily_jobs(at_time: str):
+    """(Re)register the three daily jobs under one tag. Caller holds the lock."""
+    schedule.clear(_DAILY_TAG)
+    schedule.every().day.at(at_time).do(run_daily_digest, write_log=True).tag(_DAILY_TAG)
+    schedule.every().day.at(at_time).do(_run_stale_check).tag(_DAILY_TAG)
+    schedule.every().day.at(at_time).do(_run_feed_poll).tag(_DAILY_TAG)
 
 
 def _scheduler_loop():
     while True:
-        schedule.run_pending()
-        time.sleep(60)  # check every minute
+        with _sched_lock:
+            idle = schedule.idle_seconds()
+        if idle is None:
+            # Nothing scheduled — park until reschedule() wakes us.
+            _wake.wait()
+        elif idle > 0:
+            # Sleep straight through to the next fire time (one wakeup per
+            # job instead of polling every minute).
+            _wake.wait(idle)
+        _wake.clear()
+        # Snapshot due jobs under the lock, then run them outside it — the
+        # digest (Claude call) and feed poll can take minutes, and holding
+        # the lock across them would block reschedule() (settings save) for
+        # that long. A job cleared mid-run just updates an orphaned object.
+        with _sched_lock:
+            due = sorted(job for job in schedule.jobs if job.should_run)
+        for job in due:
+            try:
+                job.run()
+            except Exception as e:
+                logger.error("Scheduled job %s failed: %s", job, e)
 
 
 def reschedule(new_time: str):
-    """Clear all scheduled jobs and re-add with new_time. Called after settings save."""
-    schedule.clear()
-    schedule.every().day.at(new_time).do(run_daily_digest, write_log=True)
-    schedule.every().day.at(new_time).do(_run_stale_check)
-    schedule.every().day.at(new_time).do(_run_feed_poll)
-    print(f"[scheduler] Rescheduled — digest + stale check + feed poll at {new_time} daily.")
+    """Clear the daily jobs and re-add with new_time. Called after settings save."""
+    with _sched_lock:
+        _register_daily_jobs(new_time)
+    _wake.set()
+    logger.info("Rescheduled — digest + stale check + feed poll at %s daily.", new_time)
 
 
 def start_scheduler():
     """Schedule daily jobs and start background thread. Call once at Flask startup."""
     digest_time = _load_digest_time()
-    schedule.every().day.at(digest_time).do(run_daily_digest, write_log=True)
-    schedule.every().day.at(digest_time).do(_run_stale_check)
-    schedule.every().day.at(digest_time).do(_run_feed_poll)
+    with _sched_lock:
+        _register_daily_jobs(digest_time)
     t = threading.Thread(target=_scheduler_loop, daemon=True, name="JobSearchScheduler")
     t.start()
-    print(f"[scheduler] Started — digest + stale check + feed poll scheduled at {digest_time} daily.")
+    logger.info("Started — digest + stale check + feed poll scheduled at %s daily.", digest_time)
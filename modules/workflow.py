@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from datetime import date, timedelta
 
-from db.database import execute_query
+from db.database import execute_query, transaction
 from models.opportunity import get_opportunity, update_opportunity
 from models.activity import log_activity
 
@@ -89,18 +89,20 @@ def advance_stage(opportunity_id: int, new_stage: str, note: str = None, close_r
     if new_stage == "Applied" and old_stage != "Applied":
         update_kwargs["date_applied"] = date.today().isoformat()
 
-    update_opportunity(opportunity_id, **update_kwargs)
-
     description = f"Stage changed: {old_stage} → {new_stage}"
     if note:
         description += f" | Note: {note}"
 
-    log_activity(
-        activity_type="Stage Change",
-        description=description,
-        opportunity_id=opportunity_id,
-        metadata={"old_stage": old_stage, "new_stage": new_stage, "next_action_date": next_action_date},
-    )
+    # Stage update and its log entry commit together — one fsync, and no
+    # window where the stage moved but the activity trail doesn't show it.
+    with transaction():
+        update_opportunity(opportunity_id, **update_kwargs)
+        log_activity(
+            activity_type="Stage Change",
+            description=description,
+            opportunity_id=opportunity_id,
+            metadata={"old_stage": old_stage, "new_stage": new_stage, "next_action_date": next_action_date},
+        )
     logger.info(f"Opp {opportunity_id}: {old_stage} → {new_stage} (next action in {days_out}d)")
 
 
@@ -131,3 +133,13 @@ def get_pipeline_summary() -> list[dict]:
     """Pull from the pipeline_summary view."""
     rows = execute_query("SELECT * FROM pipeline_summary", fetch="all")
     return [dict(r) for r in rows] if rows else []
+
+
+def get_stage_counts() -> dict[str, int]:
+    """Open-opportunity counts per stage as a dict, built straight off the
+    cursor — no per-request reshaping needed in the view layer."""
+    rows = execute_query(
+        "SELECT stage, COUNT(*) AS count FROM opportunities WHERE stage != 'Closed' GROUP BY stage",
+        fetch="all"
+    )
+    return {r["stage"]: r["count"] for r in rows} if rows else {}
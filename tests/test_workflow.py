@@ -15,8 +15,15 @@ os.environ.setdefault("ANTHROPIC_API_KEY", "test-key-mock")
 os.environ["DB_PATH"] = ":memory:"
 
 import db.database as _db
-# Force reinit with in-memory DB
-_db.init_db()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _db_init():
+    # One DDL pass per session instead of re-running at every import/collect.
+    # The :memory: DB uses a shared module-level connection, so tables created
+    # here are visible to every query in the run.
+    _db.init_db()
+    yield
 
 from models.opportunity import create_opportunity
 from models.contact import create_contact, update_contact
@@ -2,12 +2,50 @@
 web/app.py — Local Flask dashboard (127.0.0.1:5001). No auth needed.
 """
 import os
+import tempfile
+
 from flask import Flask
+from flask.json.provider import JSONProvider
+from jinja2 import FileSystemBytecodeCache
+
+from jsonutil import orjson
 from web.routes import register_routes
 
+
+class ORJSONProvider(JSONProvider):
+    """jsonify via orjson — serializes straight to bytes in C, which matters
+    for large payloads like digest text and batch-score results."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 _templates = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
 app = Flask(__name__, template_folder=_templates)
 app.secret_key = "jobsearch-local-only-no-auth-needed"
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+# Templates never change while the app is running — compile each one once
+# per process and persist the bytecode across restarts.
+app.config["TEMPLATES_AUTO_RELOAD"] = False
+app.jinja_env.auto_reload = False
+_bcc_dir = os.path.join(tempfile.gettempdir(), "fiarrd_jinja_cache")
+os.makedirs(_bcc_dir, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(_bcc_dir)
+
+
+def _precompile_templates():
+    """Compile every template at boot so no request pays first-hit parse cost."""
+    with app.app_context():
+        for name in app.jinja_env.list_templates(extensions=("html",)):
+            app.jinja_env.get_template(name)
+
+
+_precompile_templates()
 
 register_routes(app)
 
@@ -15,4 +53,10 @@ register_routes(app)
 def run():
     from modules.scheduler import start_scheduler
     start_scheduler()
-    app.run(host="0.0.0.0", port=5001, debug=False)
+    try:
+        from waitress import serve
+    except ImportError:
+        # Werkzeug fallback — threaded so AI/DB-bound requests don't serialize
+        app.run(host="0.0.0.0", port=5001, debug=False, threaded=True)
+        return
+    serve(app, host="0.0.0.0", port=5001, threads=8)
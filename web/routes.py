@@ -6,23 +6,49 @@ import io
 import json
 import os
 import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date, timedelta
+from functools import lru_cache
+from itertools import chain
+from uuid import uuid4
 
-from flask import render_template, request, redirect, url_for, jsonify, flash, make_response, send_file
+from flask import render_template, stream_template, request, redirect, jsonify, flash, make_response, send_file
 
-from models.opportunity import list_opportunities, get_opportunity, update_opportunity, create_opportunity
-from models.contact import list_contacts, get_contact, update_contact, create_contact
+from db.database import transaction
+from jsonutil import json_loads as _json_loads
+from models.opportunity import (
+    list_opportunities, iter_opportunities, get_opportunity, append_note,
+    update_opportunity, create_opportunity,
+)
+from models.contact import (
+    list_contacts_with_followup, get_contact, update_contact,
+    create_contact, get_contacts_for_opportunity,
+)
 from models.activity import get_activity_log, log_activity
 from modules.workflow import (
-    get_today_queue, get_pipeline_summary, get_followup_queue,
+    get_today_queue, get_pipeline_summary, get_stage_counts,
     flag_stale_records, advance_stage, calculate_next_action
 )
 from config import (
-    STAGE_ORDER, JOB_FAMILIES, RESUME_CACHE_PATH, APP_SETTINGS_PATH,
+    STAGE_ORDER, STAGE_INDEX, JOB_FAMILIES, RESUME_CACHE_PATH, APP_SETTINGS_PATH,
     SMTP_HOST, SMTP_PORT, SMTP_FROM, SENDER_NAME,
 )
 
 
+@lru_cache(maxsize=512)
+def _parsed_fit(opp_id: int, updated_at: str, raw: str):
+    """Parsed ai_fit_summary memoized per opportunity.
+
+    updated_at keys the cache, so any write to the row (which bumps the
+    trigger-maintained timestamp) invalidates naturally; repeat views of an
+    unchanged opportunity skip the JSON parse entirely.
+    """
+    try:
+        return _json_loads(raw)
+    except (ValueError, TypeError):
+        return None
+
+
 def _load_app_settings() -> dict:
     """Load app_settings.json; return empty dict if missing or malformed."""
     try:
@@ -34,22 +60,52 @@ def _load_app_settings() -> dict:
     return {}
 
 
+# Redirect targets are fixed at startup (no blueprints, no URL prefix), so
+# plain path strings skip the url_for rule-map walk on every mutating request.
+def _detail_url(opp_id: int) -> str:
+    return f"/opportunity/{opp_id}"
+
+
+# Background jobs for request handlers that would otherwise block on Claude.
+_EXEC = ThreadPoolExecutor(max_workers=2, thread_name_prefix="web-job")
+_JOBS: dict[str, Future] = {}
+
+# Dashboard aggregates cache. Keyed on (last activity-log id, today's date):
+# nearly every write path logs an activity row, so MAX(id) is a one-seek
+# change probe, and the date key rolls the queue over at midnight. The short
+# TTL covers the few writes that bypass the log.
+_DASHBOARD_TTL = 30.0
+_dashboard_cache = {"key": None, "expires": 0.0, "data": None}
+
+
+def _dashboard_data() -> dict:
+    from time import monotonic
+    from db.database import execute_query
+    probe = execute_query("SELECT MAX(id) AS last_id FROM activity_log", fetch="one")
+    key = (probe["last_id"] if probe else None, date.today().isoformat())
+    now = monotonic()
+    if _dashboard_cache["key"] == key and now < _dashboard_cache["expires"]:
+        return _dashboard_cache["data"]
+    data = {
+        "today_queue": get_today_queue(),
+        "pipeline": get_pipeline_summary(),
+        "stage_counts": get_stage_counts(),
+        "stale": flag_stale_records(days_stale=7),
+    }
+    _dashboard_cache["key"] = key
+    _dashboard_cache["expires"] = now + _DASHBOARD_TTL
+    _dashboard_cache["data"] = data
+    return data
+
+
 def register_routes(app):
 
     @app.route("/")
     def dashboard():
-        today_queue = get_today_queue()
-        pipeline = get_pipeline_summary()
-        stale = flag_stale_records(days_stale=7)
-        # Build stage counts dict
-        stage_counts = {row["stage"]: row["count"] for row in pipeline}
         return render_template(
             "dashboard.html",
-            today_queue=today_queue,
-            pipeline=pipeline,
-            stage_counts=stage_counts,
-            stale=stale,
             stage_order=STAGE_ORDER,
+            **_dashboard_data(),
         )
 
     @app.route("/run-feed-poll", methods=["POST"])
@@ -96,9 +152,25 @@ def register_routes(app):
 
     @app.route("/run-digest", methods=["POST"])
     def run_digest():
+        # Digest generation calls Claude — run it off-request so the worker
+        # is free immediately; the page polls the job id for the result.
         from modules.digest import run_daily_digest
-        digest = run_daily_digest(write_log=True)
-        return jsonify({"digest": digest})
+        job_id = uuid4().hex
+        _JOBS[job_id] = _EXEC.submit(run_daily_digest, write_log=True)
+        return jsonify({"job_id": job_id}), 202
+
+    @app.route("/run-digest/<job_id>")
+    def run_digest_status(job_id):
+        fut = _JOBS.get(job_id)
+        if fut is None:
+            return jsonify({"error": "Unknown job id"}), 404
+        if not fut.done():
+            return jsonify({"done": False})
+        _JOBS.pop(job_id, None)
+        try:
+            return jsonify({"done": True, "digest": fut.result()})
+        except Exception as e:
+            return jsonify({"done": True, "error": f"Digest failed: {e}"})
 
     @app.route("/opportunities")
     def opportunities():
@@ -108,13 +180,17 @@ def register_routes(app):
         include_closed = request.args.get("include_closed") == "1"
         # Exclude closed by default unless explicitly requested or filtering to Closed
         exclude_closed = not include_closed and stage_filter != "Closed"
-        opps = list_opportunities(
+        opps_iter = iter_opportunities(
             stage=stage_filter,
             tier=tier_filter,
             job_family=family_filter,
             exclude_closed=exclude_closed,
         )
-        return render_template(
+        # Peek one row so the template's `{% if opportunities %}` empty state
+        # still works, then stream the rest straight off the cursor.
+        first = next(opps_iter, None)
+        opps = chain((first,), opps_iter) if first is not None else ()
+        return stream_template(
             "opportunities.html",
             opportunities=opps,
             stage_order=STAGE_ORDER,
@@ -127,24 +203,30 @@ def register_routes(app):
 
     @app.route("/opportunity/<int:opp_id>")
     def opportunity_detail(opp_id):
+        from db.database import execute_query
         opp = get_opportunity(opp_id)
         if not opp:
             return "Opportunity not found", 404
-        contacts = list_contacts(opportunity_id=opp_id)
+        # ETag covers the row AND its activity trail: contact adds and log
+        # entries don't bump opportunities.updated_at, but every mutation on
+        # this page writes activity_log, so the opp-scoped MAX(id) (indexed)
+        # catches them. On a revalidation hit the contacts/activity queries
+        # and JSON parses are skipped entirely.
+        last_act = execute_query(
+            "SELECT MAX(id) AS last_id FROM activity_log WHERE opportunity_id = ?",
+            (opp_id,), fetch="one",
+        )["last_id"]
+        etag = f"{opp_id}-{opp.updated_at}-{last_act}"
+        if request.if_none_match.contains(etag):
+            return "", 304
+        contacts = get_contacts_for_opportunity(opp_id)
         activity = get_activity_log(opportunity_id=opp_id)
         fit_summary = None
         if opp.ai_fit_summary:
-            try:
-                fit_summary = json.loads(opp.ai_fit_summary)
-            except Exception:
-                pass
-        keywords = []
-        if opp.jd_keywords:
-            try:
-                keywords = json.loads(opp.jd_keywords)
-            except Exception:
-                pass
-        return render_template(
+            fit_summary = _parsed_fit(opp.id, opp.updated_at, opp.ai_fit_summary)
+        # Parsed once per instance by the model (already orjson-backed)
+        keywords = opp.keywords
+        resp = make_response(render_template(
             "opportunity.html",
             opp=opp,
             contacts=contacts,
@@ -153,7 +235,10 @@ def register_routes(app):
             keywords=keywords,
             stage_order=STAGE_ORDER,
             job_families=JOB_FAMILIES,
-        )
+        ))
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "private, must-revalidate"
+        return resp
 
     @app.route("/opportunity/<int:opp_id>/advance", methods=["POST"])
     def advance_opp(opp_id):
@@ -162,7 +247,7 @@ def register_routes(app):
         close_reason = request.form.get("close_reason") or None
         if new_stage:
             advance_stage(opp_id, new_stage, note=note or None, close_reason=close_reason)
-        return redirect(url_for("opportunity_detail", opp_id=opp_id))
+        return redirect(_detail_url(opp_id))
 
     @app.route("/opportunities/score-unscored", methods=["POST"])
     def score_unscored():
@@ -218,50 +303,43 @@ def register_routes(app):
     @app.route("/opportunity/<int:opp_id>/note", methods=["POST"])
     def add_note(opp_id):
         note_text = request.form.get("note", "").strip()
-        if note_text:
-            opp = get_opportunity(opp_id)
-            existing = opp.notes or ""
-            from datetime import date
-            new_notes = f"{existing}\n[{date.today()}] {note_text}".strip()
-            update_opportunity(opp_id, notes=new_notes)
+        if not note_text:
+            return redirect(_detail_url(opp_id))
+        # One UPDATE with SQL-side concat — no read-modify-write round-trip —
+        # committed together with its log entry (one fsync for the pair).
+        with transaction():
+            append_note(opp_id, f"[{date.today()}] {note_text}")
             log_activity(
                 activity_type="Note Added",
                 description=note_text,
                 opportunity_id=opp_id,
             )
-        return redirect(url_for("opportunity_detail", opp_id=opp_id))
+        return redirect(_detail_url(opp_id))
 
     @app.route("/contacts")
     def contacts():
-        all_contacts = list_contacts()
-        # Color-code by response_status
-        status_colors = {
-            "Pending": "#f59e0b",
-            "Responded": "#10b981",
-            "No Response": "#ef4444",
-            "Meeting Scheduled": "#3b82f6",
-        }
-        followups = get_followup_queue()
-        followup_ids = {f["contact_id"] for f in followups}
+        # One query — each row arrives with its is_followup flag set in SQL.
+        all_contacts = list_contacts_with_followup()
+        followup_count = sum(1 for c in all_contacts if c["is_followup"])
         return render_template(
             "contacts.html",
             contacts=all_contacts,
-            status_colors=status_colors,
-            followup_ids=followup_ids,
+            followup_count=followup_count,
         )
 
     @app.route("/contact/<int:contact_id>/mark-response", methods=["POST"])
     def mark_response(contact_id):
         status = request.form.get("status", "Responded")
-        update_contact(contact_id, response_status=status)
         contact = get_contact(contact_id)
-        log_activity(
-            activity_type="Response Received",
-            description=f"Response status updated to: {status}",
-            opportunity_id=contact.opportunity_id if contact else None,
-            contact_id=contact_id,
-        )
-        return redirect(url_for("contacts"))
+        with transaction():
+            update_contact(contact_id, response_status=status)
+            log_activity(
+                activity_type="Response Received",
+                description=f"Response status updated to: {status}",
+                opportunity_id=contact.opportunity_id if contact else None,
+                contact_id=contact_id,
+            )
+        return redirect("/contacts")
 
     @app.route("/opportunity/<int:opp_id>/score-fit", methods=["POST"])
     def score_fit_route(opp_id):
@@ -336,7 +414,7 @@ def register_routes(app):
             from modules.docx_builder import build_resume_docx
             opp = get_opportunity(opp_id)
             if not opp or not opp.tailored_resume:
-                return redirect(url_for("opportunity_detail", opp_id=opp_id))
+                return redirect(_detail_url(opp_id))
             settings = _load_app_settings()
             template_path = settings.get("resume_template_path", "").strip() or None
             docx_bytes = build_resume_docx(opp.tailored_resume, template_path)
@@ -360,7 +438,7 @@ def register_routes(app):
             from modules.docx_builder import build_cover_letter_docx
             opp = get_opportunity(opp_id)
             if not opp or not opp.cover_letter:
-                return redirect(url_for("opportunity_detail", opp_id=opp_id))
+                return redirect(_detail_url(opp_id))
             settings = _load_app_settings()
             template_path = settings.get("cover_letter_template_path", "").strip() or None
             docx_bytes = build_cover_letter_docx(opp.cover_letter, template_path)
@@ -384,7 +462,7 @@ def register_routes(app):
             return "Opportunity not found", 404
         full_name = request.form.get("full_name", "").strip()
         if not full_name:
-            return redirect(url_for("opportunity_detail", opp_id=opp_id))
+            return redirect(_detail_url(opp_id))
         title = request.form.get("title", "").strip() or None
         company = request.form.get("company", "").strip() or opp.company
         linkedin_url = request.form.get("linkedin_url", "").strip() or None
@@ -407,7 +485,7 @@ def register_routes(app):
             opportunity_id=opp_id,
             contact_id=contact_id,
         )
-        return redirect(url_for("opportunity_detail", opp_id=opp_id))
+        return redirect(_detail_url(opp_id))
 
     @app.route("/add-job/preview-fit", methods=["POST"])
     def add_job_preview_fit():
@@ -544,9 +622,9 @@ def register_routes(app):
                 import traceback
                 traceback.print_exc()
                 return render_template("add_job.html", step=1, error=f"Failed to save opportunity: {e}")
-            return redirect(url_for("opportunity_detail", opp_id=opp_id))
+            return redirect(_detail_url(opp_id))
 
-        return redirect(url_for("add_job"))
+        return redirect("/add-job")
 
     @app.route("/contact/<int:contact_id>/draft-outreach", methods=["POST"])
     def draft_outreach_route(contact_id):
@@ -643,7 +721,7 @@ def register_routes(app):
     def export_csv():
         opps = list_opportunities(exclude_closed=False)
         if not opps:
-            return redirect(url_for("opportunities"))
+            return redirect("/opportunities")
         fields = ["id", "company", "role_title", "job_family", "tier", "stage", "source",
                   "fit_score", "salary_range", "next_action", "next_action_date",
                   "date_added", "date_applied", "jd_url"]
@@ -662,7 +740,7 @@ def register_routes(app):
     def mark_followup(contact_id):
         contact = get_contact(contact_id)
         if not contact or not contact.outreach_day0:
-            return redirect(url_for("contacts"))
+            return redirect("/contacts")
         days_since = (date.today() - date.fromisoformat(contact.outreach_day0)).days
         today_str = date.today().isoformat()
         if days_since >= 6:
@@ -677,7 +755,7 @@ def register_routes(app):
             opportunity_id=contact.opportunity_id,
             contact_id=contact_id,
         )
-        return redirect(url_for("contacts"))
+        return redirect("/contacts")
 
     @app.route("/settings", methods=["GET", "POST"])
     def settings():
@@ -734,7 +812,7 @@ def register_routes(app):
                     app_settings["feed_min_score"] = feed_min_score
                     with open(APP_SETTINGS_PATH, "w", encoding="utf-8") as f:
                         json.dump(app_settings, f, indent=2)
-                    return redirect(url_for("settings") + "?saved=1")
+                    return redirect("/settings?saved=1")
                 except Exception as e:
                     error = f"Could not save feed settings: {e}"
             elif section == "templates":
@@ -745,7 +823,7 @@ def register_routes(app):
                     app_settings["cover_letter_template_path"] = cover_letter_template_path
                     with open(APP_SETTINGS_PATH, "w", encoding="utf-8") as f:
                         json.dump(app_settings, f, indent=2)
-                    return redirect(url_for("settings") + "?saved=1")
+                    return redirect("/settings?saved=1")
                 except Exception as e:
                     error = f"Could not save template settings: {e}"
             elif section == "smtp":
@@ -760,7 +838,7 @@ def register_routes(app):
                     app_settings["sender_name"] = sender_name
                     with open(APP_SETTINGS_PATH, "w", encoding="utf-8") as f:
                         json.dump(app_settings, f, indent=2)
-                    return redirect(url_for("settings") + "?saved=1")
+                    return redirect("/settings?saved=1")
                 except Exception as e:
                     error = f"Could not save SMTP settings: {e}"
             else:
@@ -778,7 +856,7 @@ def register_routes(app):
                             reschedule(new_digest_time)
                         except Exception:
                             pass
-                    return redirect(url_for("settings") + "?saved=1")
+                    return redirect("/settings?saved=1")
                 except Exception as e:
                     error = f"Could not save settings: {e}"
                     resume_text = new_text
@@ -807,13 +885,10 @@ def register_routes(app):
                    ROUND(AVG(julianday('now') - julianday(date_added)), 0) as avg_days_open
             FROM opportunities
             GROUP BY stage
-            ORDER BY CASE stage
-                WHEN 'Prospect' THEN 1 WHEN 'Warm Lead' THEN 2 WHEN 'Applied' THEN 3
-                WHEN 'Recruiter Screen' THEN 4 WHEN 'HM Interview' THEN 5
-                WHEN 'Loop' THEN 6 WHEN 'Offer Pending' THEN 7 WHEN 'Closed' THEN 8
-                ELSE 9 END
         """, fetch='all')
         stages = [dict(r) for r in (stage_rows or [])]
+        # Pipeline order comes from config, not a hand-maintained SQL CASE.
+        stages.sort(key=lambda s: STAGE_INDEX.get(s['stage'], len(STAGE_ORDER)))
         max_count = max((s['count'] for s in stages), default=1)
         for s in stages:
             s['pct'] = round(s['count'] / max_count * 100)